@@ -0,0 +1,68 @@
+import os
+import time
+from functools import partial
+from multiprocessing import Pool
+import matplotlib.pyplot as plt
+from numpy import log, exp
+from sklearn.linear_model import LinearRegression
+from typing import Callable, List, Tuple, Any
+from table import Table
+from random_table import Random_Table
+from stable_matching import Stable_Matching
+
+FIGURES_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Figures')
+
+def average_execution_time(fun: Callable, args: Tuple[Any,...] = (), M: int = 1000,
+                           silent: bool = False) -> float|None:
+    '''
+    Takes a function fun and prints the average time it takes to run fun(*args).
+    The number of simulations is M.
+    If silent=True, the average execution time is returned instead of printed.
+    '''
+    start = time.perf_counter()
+    for _ in range(M): fun(*args)
+    end = time.perf_counter()
+    aet = (end-start)/M
+    if silent:  return aet
+    aet = float('%.2g'%aet)
+    print(f"Average time of execution for {fun.__name__}{args} is {aet} seconds.")
+
+def given_example() -> None:
+    proposer: Table = Table({'A': ['c', 'b', 'd', 'a'], 'B': ['b', 'a', 'c', 'd'], \
+        'C': ['b', 'd', 'a', 'c'], 'D': ['c', 'a', 'd', 'b']})
+    acceptor: Table =  Table({'a': ['A', 'B', 'D', 'C'], 'b': ['C', 'A', 'D', 'B'], \
+        'c': ['C', 'B', 'D', 'A'], 'd': ['B', 'A', 'C', 'D']})
+    s = Stable_Matching(proposer,acceptor)
+    s.solve_problem()
+
+def random_example(n: int) -> None:
+    Stable_Matching(Random_Table(n),Random_Table(n)).solve_problem()
+
+def measure_random_example(n: int, M: int = 20) -> float:
+    '''
+    Average execution time of random_example(n) over M simulations. The generator of Random_Table 
+    is seeded with n, so that the result does not depend on the process that runs it.
+    '''
+    Random_Table.seed(n)
+    return average_execution_time(random_example, (n,), M=M, silent=True)
+
+if __name__ == "__main__":
+    # Performance analysis of Stable_Matching, as in Task 8 of the notebook.
+    average_execution_time(given_example)
+
+    # The values of n are timed independently, so they are distributed over all cores
+    n_vals = list(range(5,101))
+    with Pool() as pool:
+        aets: List[float] = pool.map(partial(measure_random_example, M=20), n_vals)
+
+    # Fitting log T = A + B * log n gives the estimated time complexity O(n^B)
+    model = LinearRegression().fit( log(n_vals).reshape((-1, 1)) ,  log(aets) )
+    print(f"The coefficient of linear regression B={round(model.coef_[0],3)}")
+
+    plt.loglog(n_vals,aets)
+    plt.loglog(n_vals, exp(model.intercept_) * n_vals**model.coef_,\
+        color='black', linestyle='dashed')
+    plt.xlabel(r"n")
+    plt.title("Average execution time of Stable Matching")
+    plt.legend(["Execution time","Fitted"])
+    plt.savefig(os.path.join(FIGURES_DIR, "execution_time.png"))
@@ -1,4 +1,5 @@
-import random
+import numpy as np
+from functools import cached_property
 from collections.abc import Sequence
 from typing import Iterable, Dict, Sequence, Any
 from table import Table
@@ -6,16 +7,48 @@ from table import Table
 Sym: Any = int | str 
 
 class Random_Table(Table): 
+    # Random generator shared by all Random_Tables; reseeded with Random_Table.seed
+    _rng: np.random.Generator = np.random.default_rng(1)
+
     def __init__(self,n: int, **kwargs ) -> None:
         table: Dict[int,Sequence[int]] = self.generate_random_table(n,**kwargs)
-        super().__init__(table)
+        # With the default symbols 0:n-1 the preference lists are permutations of indices
+        self.default_val_syms: bool = kwargs.get('val_syms') is None
+        # and, if the keys are 0:n-1 too, the table is valid by construction, so validation is skipped
+        self.default_syms: bool = self.default_val_syms and kwargs.get('key_syms') is None
+        super().__init__(table, _skip_validation=self.default_syms)
 
     def generate_random_table(self,n: int,key_syms: Iterable[Sym]|None = None , 
                                           val_syms: Sequence[Sym]|None = None) -> Dict[Sym,Sequence[Sym]]:
         '''
         Generates random preference tables of size n as a dictionary.
         If symbols are missing they are set to 0:n-1.
+        The preference lists are drawn at once as an int32 array of permutations (self.perms) of 
+        the indices of val_syms, using the generator of the class.
+        '''
+        key_syms = list(range(n)) if key_syms is None else list(key_syms)
+        m: int = n if val_syms is None else len(val_syms)
+        perms: np.ndarray = np.broadcast_to(np.arange(m, dtype=np.int32), (len(key_syms),m))
+        self.perms: np.ndarray = self._rng.permuted(perms, axis=1)[:,:n]
+        if val_syms is None: return dict(zip(key_syms, self.perms.tolist()))
+        return {key:[val_syms[j] for j in row] for key,row in zip(key_syms, self.perms.tolist())}
+
+    @classmethod
+    def seed(cls, s: int|None = None) -> None:
+        '''Seeds the random generator of Random_Table so that random tables are reproducible.'''
+        cls._rng = np.random.default_rng(s)
+
+    @cached_property
+    def rank(self) -> Dict[Sym,Any]:
+        '''
+        When the preference lists are permutations of 0:n-1 (default val_syms), the rankings are 
+        lists indexed by the symbols instead of dictionaries. They are the inverse permutations 
+        of the preference lists, computed at once with argsort of self.perms. 
+        The imaginary undesirable symbol None corresponds to the index n, with ranking n.
+        Otherwise, the rankings are computed as in Table.rank.
         '''
-        if key_syms is None: key_syms = list(range(n))
-        if val_syms is None: val_syms = list(range(n))
-        return {i:random.sample(val_syms,n) for i in key_syms} 
\ No newline at end of file
+        if not self.default_val_syms: return super().rank
+        n: int = len(self)
+        rank: np.ndarray = np.full((n,n+1), n, dtype=np.int32)
+        rank[:,:n] = np.argsort(self.perms, axis=1)
+        return dict(zip(self, rank.tolist()))
@@ -0,0 +1,117 @@
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+from numpy import log, transpose, linspace, mean
+from sklearn.linear_model import LinearRegression
+from typing import Dict, Tuple
+from random_table import Random_Table
+from stable_matching import Stable_Matching, gale_shapley
+
+FIGURES_DIR: str = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Figures')
+
+def random_score(n: int) -> Tuple[int,int]:
+    '''Returns scores for some random preference tables of size n.'''
+    r = Stable_Matching(Random_Table(n), Random_Table(n))
+    match = r.solve_problem()
+    return r.compute_score(match)
+
+def random_scores(n: int, M: int = 1000) -> Tuple[np.ndarray,np.ndarray]:
+    '''Returns the scores of M random problems of size n.'''
+    scores_prop: np.ndarray = np.empty(M, dtype=np.int32)
+    scores_acc: np.ndarray = np.empty(M, dtype=np.int32)
+    for i in range(M):
+        scores_prop[i], scores_acc[i] = random_score(n)
+    return scores_prop, scores_acc
+
+def batched_random_scores(n: int, M: int = 1000,
+                          rng: np.random.Generator|None = None) -> Tuple[np.ndarray,np.ndarray]:
+    '''
+    Same as random_scores, but no Table or Stable_Matching objects are created: the preference 
+    lists (proposers and acceptors are 0:n-1) are drawn into two (n,n) int32 buffers that are 
+    permuted in place for each of the M problems and passed directly to gale_shapley, 
+    and the scores are written into preallocated arrays. Memory is O(n^2), independent of M.
+    By default the generator of Random_Table is used.
+    '''
+    if rng is None: rng = Random_Table._rng
+    scores_prop: np.ndarray = np.empty(M, dtype=np.int32)
+    scores_acc: np.ndarray = np.empty(M, dtype=np.int32)
+    props: np.ndarray = np.arange(n)
+    ranks: np.ndarray = np.arange(n, dtype=np.int32)
+    prop_pref: np.ndarray = np.broadcast_to(ranks, (n,n)).copy()
+    acc_pref: np.ndarray = prop_pref.copy()
+    prop_rank: np.ndarray = np.empty((n,n), dtype=np.int32)
+    acc_rank: np.ndarray = np.full((n,n+1), n, dtype=np.int32)
+    for i in range(M):
+        # A random permutation of a permutation is again uniformly random
+        rng.permuted(prop_pref, axis=1, out=prop_pref)
+        rng.permuted(acc_pref, axis=1, out=acc_pref)
+        prop_rank[props[:,None], prop_pref] = ranks
+        acc_rank[props[:,None], acc_pref] = ranks
+        matching: np.ndarray = np.array(gale_shapley(prop_pref.tolist(), acc_rank.tolist()), dtype=np.intp)
+        scores_prop[i] = prop_rank[props, matching].sum()
+        scores_acc[i] = acc_rank[matching, props].sum()
+    return scores_prop, scores_acc
+
+def plot_hist(ax: plt.Axes, n: int, scores_prop: np.ndarray, scores_acc: np.ndarray) -> None:
+    '''Plots the histograms of the proposer and acceptor scores for size n on ax.'''
+    ax.clear()
+    ax.hist(scores_prop, alpha=0.8)
+    ax.hist(scores_acc, alpha=0.8)
+    ax.set_xlabel("Score")
+    ax.set_title(f"Scores for n={n}")
+    ax.legend(["Proposer","Acceptor"])
+
+def plot_whiskers(ax: plt.Axes, n_vals: np.ndarray, scores_prop: np.ndarray, 
+                  scores_acc: np.ndarray) -> None:
+    '''Plots the whisker plots of the proposer (blue) and acceptor (red) scores against n on ax.'''
+    ax.clear()
+    for scores,c in  [(scores_prop,"blue"), (scores_acc,"red")]:
+        ax.boxplot(transpose(scores), boxprops=dict(color=c),
+                    capprops=dict(color=c),
+                    whiskerprops=dict(color=c),
+                    flierprops=dict(color=c, markeredgecolor=c),
+                    medianprops=dict(color=c),
+                    positions = n_vals,
+                    widths= n_vals/3
+                    )
+    ax.set_yscale('log')
+    ax.set_xscale('log')
+    ax.set_xlabel(r'n')
+    ax.set_title('Score whisker plots')
+
+def render_all(hists: Dict[int,Tuple[np.ndarray,np.ndarray]], n_vals: np.ndarray, 
+               scores_prop: np.ndarray, scores_acc: np.ndarray) -> None:
+    '''
+    Renders all the plots in FIGURES_DIR once the scores have been computed; 
+    a single figure is created and its axes are cleared and reused for every plot.
+    '''
+    fig, ax = plt.subplots()
+    for n, (scores_prop_n, scores_acc_n) in hists.items():
+        plot_hist(ax, n, scores_prop_n, scores_acc_n)
+        fig.savefig(os.path.join(FIGURES_DIR, f"scores_n={n}.png"), dpi=100)
+    plot_whiskers(ax, n_vals, scores_prop, scores_acc)
+    fig.savefig(os.path.join(FIGURES_DIR, "scores_whisker_plot.png"), dpi=100)
+    plt.close(fig)
+
+if __name__ == "__main__":
+    # Score distributions for proposers and acceptors, as in Task 9 of the notebook.
+    # All the scores are computed first and the plots are rendered at the end.
+    Random_Table.seed(1)
+    hists: Dict[int,Tuple[np.ndarray,np.ndarray]] = {n: batched_random_scores(n) for n in (10, 100)}
+
+    n_vals = 2**linspace(1,7,10)
+    M = 50
+    scores_prop: np.ndarray = np.empty((len(n_vals),M), dtype=np.int32)
+    scores_acc: np.ndarray = np.empty((len(n_vals),M), dtype=np.int32)
+    for i, n in enumerate(n_vals):
+        scores_prop[i], scores_acc[i] = batched_random_scores(int(n),M=M)
+
+    plt.rcParams['path.simplify'] = True
+    plt.rcParams['agg.path.chunksize'] = 10000
+    render_all(hists, n_vals, scores_prop, scores_acc)
+
+    # Scores are of order O(n^B), where B is the coefficient of the linear fit log S = A + B log n
+    for scores, group in  [(scores_prop,"proposer"), (scores_acc,"acceptor")]:
+        means = mean(transpose(scores),axis=0)
+        model = LinearRegression().fit( log(n_vals).reshape((-1, 1)) ,  log(means) )
+        print(f"The coefficient of linear regression for {group} score B={round(model.coef_[0],3)}")
@@ -1,50 +1,164 @@
-import random
-from typing import Iterable, Dict, Any, Tuple
-from table import Table
+import numpy as np
+from multiprocessing.pool import Pool
+from typing import Iterable, Dict, List, Any, Tuple, NamedTuple
+from table import Table, _Table_Arrays
 from random_table import Random_Table
 
 Sym: Any = int | str | None
 
+class Solution(NamedTuple):
+    '''Result of Stable_Matching.solve_all.'''
+    matching: Dict[Sym,Sym]
+    stable: bool
+    score_proposer: int
+    score_acceptor: int
+
+def gale_shapley(prop_pref: List[List[int]], acc_rank: List[List[int]]) -> List[int]:
+    '''
+    Gale-Shapley algorithm on integer indices 0:n-1 for proposers and acceptors.
+    prop_pref[i][k] is the k-th preference of proposer i and acc_rank[j][i] is the ranking of 
+    proposer i according to acceptor j, with acc_rank[j][n] = n for the imaginary proposer None.
+    Returns a list whose i-th element is the acceptor matched to proposer i.
+    This is the accelerated variant of deferred acceptance: every acceptor keeps the ranking of 
+    their current proposer (threshold), so a proposer skips the acceptors that would reject them 
+    without changing the matching.
+    '''
+    n: int = len(prop_pref)
+    prop_individual_score: List[int] = [0] * n
+    threshold: List[int] = [n] * n
+    matching: List[int] = [n] * n
+    inv_matching: List[int] = [n] * n
+    prop: int
+    for prop in range(n):
+        while prop != n:
+            prefs: List[int] = prop_pref[prop]
+            k: int = prop_individual_score[prop]
+            acc: int = prefs[k]
+            rank: int = acc_rank[acc][prop]
+            #Sure rejections; every proposer is accepted before reaching the end of their list
+            while rank >= threshold[acc]:
+                k += 1
+                acc = prefs[k]
+                rank = acc_rank[acc][prop]
+            prop_individual_score[prop] = k + 1
+            matching[prop] = acc
+            threshold[acc] = rank
+            #The current proposer of acc (None if there is none) is rejected and proposes next
+            prop, inv_matching[acc] = inv_matching[acc], prop
+    return matching
+
+def as_dict(matching: List[int]|np.ndarray, prop_syms: List[Sym], acc_syms: List[Sym]) -> Dict[Sym,Sym]:
+    '''
+    Converts a matching of indices, whose i-th element is the index of the acceptor matched to 
+    proposer i, to a dictionary of symbols; prop_syms and acc_syms map the indices to symbols.
+    '''
+    if isinstance(matching, np.ndarray): matching = matching.tolist()
+    return {prop: acc_syms[acc] for prop, acc in zip(prop_syms, matching)}
+
 class Stable_Matching:
     ''' 
     This class solves the Stable Matching Problem.
     It takes two preference tables (proposer,acceptor) with preference lists as values. 
     '''
     def __init__(self, proposer: Table, 
-                       acceptor: Table) -> None:  
+                       acceptor: Table, _skip_validation: bool = False) -> None:  
         assert isinstance(proposer,Table), 'Proposer is not a Table'   
         assert isinstance(acceptor,Table), 'Acceptor is not a Table' 
-        for t in (proposer,acceptor):   t.get_rank()
         self.proposer: Table = proposer 
         self.acceptor: Table = acceptor
-        assert self.validate_tables_share_symbols(), 'Symbol mismatch between proposer and acceptor'
+        #Random_Tables of the same size with the default symbols 0:n-1 share their symbols by construction
+        self.int_syms: bool = len(proposer) == len(acceptor) and all(
+            isinstance(t, Random_Table) and t.default_syms for t in (proposer, acceptor))
+        if not (_skip_validation or self.int_syms):
+            assert self.validate_tables_share_symbols(), 'Symbol mismatch between proposer and acceptor'
+        self.index_tables()
 
     def validate_tables_share_symbols(self) -> bool:
         '''
         Validates that the tables share the same symbols in that for every
-        preference list of a table there is a 1-1 mapping to the keys of the other table
+        preference list of a table there is a 1-1 mapping to the keys of the other table.
+        Since the preference lists have no duplicates (see Table.validator), it suffices that 
+        they have as many elements as the keys and are contained in them (no set per list).
         '''
-        vals2_in_keys1: bool  =  all( set(x) == set(self.proposer.keys()) for x in self.acceptor.values() )
-        vals1_in_keys2: bool  =  all( set(x) == set(self.acceptor.keys()) for x in self.proposer.values() )
+        prop_keys: frozenset = frozenset(self.proposer)
+        acc_keys: frozenset = frozenset(self.acceptor)
+        n_prop: int = len(prop_keys)
+        n_acc: int = len(acc_keys)
+        vals2_in_keys1: bool  =  all( len(x) == n_prop and prop_keys.issuperset(x) for x in self.acceptor.values() )
+        vals1_in_keys2: bool  =  all( len(x) == n_acc and acc_keys.issuperset(x) for x in self.proposer.values() )
         return vals1_in_keys2 and vals2_in_keys1
 
-    def matching_is_stable(self, matching: Dict[Sym,Sym]) -> bool:
+    def index_tables(self) -> None:
+        '''
+        Converts the tables once to their integer representations (see _Table_Arrays) 
+        on which the solver runs; proposers and acceptors are mapped to 0:n-1.
+        Random_Tables with the default symbols 0:n-1 (self.int_syms) are already integer-indexed, 
+        so their preference arrays are used as they are and no symbol translation is needed.
+        '''
+        prop_pref: np.ndarray|None = self.proposer.perms if self.int_syms else None
+        acc_pref: np.ndarray|None = self.acceptor.perms if self.int_syms else None
+        self.prop_arrays: _Table_Arrays = _Table_Arrays(self.proposer, self.acceptor, prop_pref)
+        self.acc_arrays: _Table_Arrays = _Table_Arrays(self.acceptor, self.proposer, acc_pref)
+
+    def matching_indices(self, matching: Dict[Sym,Sym]|np.ndarray) -> np.ndarray:
+        '''
+        Converts a matching (as a dictionary) to an array whose i-th element is the index 
+        of the acceptor matched to proposer i (indices as in index_tables).
+        Matchings that are already index arrays (see solve_array) are returned as they are.
+        '''
+        if isinstance(matching, np.ndarray): return matching
+        acc_ids: Dict[Sym,int] = self.acc_arrays.sym2idx
+        return np.fromiter((acc_ids[matching[prop]] for prop in self.prop_arrays.syms), 
+                           dtype=np.intp, count=self.prop_arrays.n)
+
+    def matching_is_stable(self, matching: Dict[Sym,Sym]|np.ndarray) -> bool:
         '''
         For a given matching (which is a dictionary with key=proposer and value=matched_acceptor)
         the algorithm checks whether the matching is stable returning True if it is.
+        For every proposer we loop over the acceptors that the proposer prefers to their current 
+        acceptor; if any of those acceptors prefers that proposer to their current proposer, 
+        the matching is unstable.
+        For n >= 32 the check is vectorized instead (see matching_is_stable_np).
+        The matching can also be given as an index array (see solve_array).
         '''
-        acc: Sym   #Acceptor
+        if self.prop_arrays.n >= 32: return self.matching_is_stable_np(self.matching_indices(matching))
+        if isinstance(matching, np.ndarray): matching = self.matching_dict(matching)
+        inv_matching: Dict[Sym,Sym] = {acc: prop for prop, acc in matching.items()}
+        #The tables and their rankings are bound once instead of being looked up in the loop
+        proposer, prop_rank, acc_rank = self.proposer, self.proposer.rank, self.acceptor.rank
         prop: Sym  #Proposer
-        props: Iterable[Sym] 
-        for acc, props in self.acceptor.items():
-            for prop in props:
-                if acc == matching[prop]:  break
-                curr_acc: Sym = matching[prop]
-                if self.proposer.rank[prop][acc] < self.proposer.rank[prop][curr_acc]:   
+        acc: Sym   #Acceptor
+        for prop, acc in matching.items():
+            for better_acc in proposer[prop][:prop_rank[prop][acc]]:
+                rank = acc_rank[better_acc]
+                if rank[prop] < rank[inv_matching[better_acc]]:
                     return False
         return True
 
-    def compute_score(self, matching: Dict[Sym,Sym]) -> Tuple[int,int]:
+    def matching_is_stable_np(self, m: np.ndarray, block: int = 256) -> bool:
+        '''
+        Vectorized version of matching_is_stable for a matching given as an index array 
+        (see matching_indices). A pair (i,j) is blocking if proposer i prefers acceptor j to m[i] 
+        and acceptor j prefers proposer i to its current proposer. The pairs are checked in blocks of 
+        block proposers at once, so that at most block*n booleans are allocated and an unstable 
+        matching is rejected at the first block that contains a blocking pair.
+        '''
+        n: int = self.prop_arrays.n
+        props: np.ndarray = np.arange(n)
+        inv_m: np.ndarray = np.full(n, n, dtype=np.intp)    #Unmatched acceptors get the proposer None
+        inv_m[m] = props
+        prop_rank: np.ndarray = self.prop_arrays.rank
+        acc_rank: np.ndarray = self.acc_arrays.rank
+        prop_curr_rank: np.ndarray = prop_rank[props, m]        #Ranking of their acceptor for each proposer
+        acc_curr_rank: np.ndarray = acc_rank[props, inv_m]      #Ranking of their proposer for each acceptor
+        for start in range(0, n, block):
+            rows: slice = slice(start, min(start + block, n))
+            prop_prefers: np.ndarray = prop_rank[rows,:n] < prop_curr_rank[rows,None]
+            acc_prefers: np.ndarray = acc_rank[:,rows].T < acc_curr_rank[None,:]
+            if (prop_prefers & acc_prefers).any(): return False
+        return True
+
+    def compute_score(self, matching: Dict[Sym,Sym]|np.ndarray) -> Tuple[int,int]:
         '''
         Computes the score for proposers and acceptors which is defined as the sum of all the rankings 
         for proposers and acceptors respectively. The higher the score for a group,
@@ -52,30 +166,73 @@ class Stable_Matching:
         satisfaction for that group implying that every member of that group got their first preference.
         The highest score is (n-1)*n which corresponds to every member of that group getting their last preference,
         where n is the number of proposers and acceptors.
+        The scores are computed on integer indices by compute_score_np, so the matching 
+        can also be given as an index array (see solve_array).
+        '''
+        return self.compute_score_np(self.matching_indices(matching))
+
+    def compute_score_np(self, m: np.ndarray) -> Tuple[int,int]:
         '''
-        score_proposer: int = sum(self.proposer.rank[prop][matching[prop]] for prop in self.proposer)
-        score_acceptor: int = sum(self.acceptor.rank[matching[prop]][prop] for prop in self.proposer)
+        Same as compute_score for a matching given as an index array (see matching_indices); 
+        the rankings are read at once from the rank arrays of index_tables.
+        '''
+        props: np.ndarray = np.arange(self.prop_arrays.n)
+        score_proposer: int = int(self.prop_arrays.rank[props, m].sum())
+        score_acceptor: int = int(self.acc_arrays.rank[m, props].sum())
         return score_proposer, score_acceptor
 
+    def solve_indices(self) -> List[int]:
+        '''
+        Runs gale_shapley on the integer indices of index_tables and returns a list whose i-th 
+        element is the index of the acceptor matched to proposer i.
+        '''
+        # Element-wise indexing of nested lists is much faster than that of numpy arrays in pure Python 
+        return gale_shapley(self.prop_arrays.pref.tolist(), self.acc_arrays.rank.tolist())
+
+    def solve_array(self) -> np.ndarray:
+        '''
+        Same as solve_problem, but the matching is returned as an int32 array of indices 
+        (see solve_indices) instead of a dictionary; it can be passed as it is to 
+        matching_is_stable and compute_score, and converted with matching_dict if needed.
+        '''
+        return np.array(self.solve_indices(), dtype=np.int32)
+
+    def matching_dict(self, matching: List[int]|np.ndarray) -> Dict[Sym,Sym]:
+        '''Converts a matching of indices (see solve_indices) to a dictionary of symbols.'''
+        if isinstance(matching, np.ndarray): matching = matching.tolist()
+        if self.int_syms: return dict(enumerate(matching))
+        return as_dict(matching, self.prop_arrays.syms, self.acc_arrays.syms)
+
     def solve_problem(self) -> Dict[Sym,Sym]:
         '''
         The Stable Matching Problem is solved using the algorithm descripted in Chapter 2 page 9
         of 'Stable Marriage and Its Relation to Other Combinatorial Problems'.
         A matching (as a dictionary) is returned.
+        The algorithm (gale_shapley) runs on the integer indices of index_tables.
+        '''
+        return self.matching_dict(self.solve_indices())
+
+    @staticmethod
+    def solve_many(prop_prefs: np.ndarray, acc_ranks: np.ndarray, pool: Pool|None = None) -> np.ndarray:
+        '''
+        Solves a batch of B independent problems of size n given directly as indices: prop_prefs 
+        (B,n,n) and acc_ranks (B,n,n+1) are stacked as in gale_shapley. Returns a (B,n) int32 array 
+        whose b-th row is the matching of the b-th problem (as in solve_indices).
+        If a multiprocessing pool is given, the problems are distributed over its processes.
+        '''
+        args: zip = zip(prop_prefs.tolist(), acc_ranks.tolist())
+        matchings: List[List[int]] = pool.starmap(gale_shapley, args) if pool else [gale_shapley(*a) for a in args]
+        return np.array(matchings, dtype=np.int32).reshape(prop_prefs.shape[:2])
+
+    def solve_all(self) -> Solution:
+        '''
+        Solves the problem and returns the matching (as a dictionary) together with its stability 
+        and its scores (see matching_is_stable and compute_score). The stability and the scores 
+        are computed on the index array of the matching, so the dictionary is not converted back.
         '''
-        prop_individual_score: Dict[Sym,int] = {prop:0 for prop in self.proposer}
-        matching: Dict[Sym,Sym|None] = {prop: None for prop in self.proposer}
-        inv_matching: Dict[Sym,Sym|None] = {acc: None for acc in self.acceptor}
-        prop: Sym|None
-        for prop in self.proposer:
-            while prop is not None:
-                acc: Sym = self.proposer[prop][prop_individual_score[prop]]
-                curr_prop: Sym|None = inv_matching[acc]    
-                if self.acceptor.rank[acc][prop] < self.acceptor.rank[acc][curr_prop]:
-                    matching[prop] = acc
-                    prop, inv_matching[acc] = inv_matching[acc], prop
-                if prop is not None: prop_individual_score[prop] += 1
-        return matching
+        matching: List[int] = self.solve_indices()
+        m: np.ndarray = np.array(matching, dtype=np.intp)
+        return Solution(self.matching_dict(matching), self.matching_is_stable_np(m), *self.compute_score_np(m))
 
 if __name__ == "__main__":
     # Two examples are shown; a predefined example given in Ch1 and Ch2 of 
@@ -86,7 +243,7 @@ if __name__ == "__main__":
     a1: Table =  Table({'a': ['A', 'B', 'D', 'C'], 'b': ['C', 'A', 'D', 'B'], \
         'c': ['C', 'B', 'D', 'A'], 'd': ['B', 'A', 'C', 'D']})
     #The second example is random with n=5 proposers and acceptors.
-    random.seed(1)
+    Random_Table.seed(1)
     p2: Table = Random_Table(n=5)
     a2: Table = Random_Table(n=5)
 
@@ -96,7 +253,7 @@ if __name__ == "__main__":
         print("Acceptor Table")
         print(acceptor)
         s: Stable_Matching = Stable_Matching(proposer,acceptor)
-        opt_matching: Dict[Sym,Sym] = s.solve_problem()
-        print(f"Matching found: {opt_matching}")
-        print(f"Matching is stable? {s.matching_is_stable(opt_matching)}")
-        print(f"Score for (proposers,acceptors) is {s.compute_score(opt_matching)}")
\ No newline at end of file
+        solution: Solution = s.solve_all()
+        print(f"Matching found: {solution.matching}")
+        print(f"Matching is stable? {solution.stable}")
+        print(f"Score for (proposers,acceptors) is {(solution.score_proposer, solution.score_acceptor)}")
\ No newline at end of file
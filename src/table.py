@@ -1,8 +1,12 @@
+import numpy as np
+from functools import cached_property
 from collections.abc import Sequence
 from tabulate import tabulate
-from typing import List, Sequence, Any
+from typing import Iterable, Dict, List, Sequence, Any
 
 Sym: Any = int | str
+#The types of Sym, looked up once rather than for every element of a table
+_SYM_TYPES: tuple = Sym.__args__
 
 def freeze(fun):
     '''
@@ -13,14 +17,19 @@ def freeze(fun):
         raise Exception(f"Method {fun.__name__} is frozen.")
     return ans
 
+def _ordinal(n: int) -> str:
+    '''Ordinal of a positive integer n, e.g. 1st, 2nd, 3rd, 4th, 11th, 21st.'''
+    return "%d%s" % (n,"tsnrhtdd"[(n//10%10!=1)*(n%10<4)*n%10::4])
+
 class Table(dict):
     '''
     This class represents the preference tables that are used in the 
     Stable Matching Problem. 
     '''
-    def __init__(self, table: Any):
+    def __init__(self, table: Any, _skip_validation: bool = False):
         super().__init__(table)
-        self.validator()
+        #Tables that are valid by construction (e.g. Random_Table) can skip the O(n^2) validation
+        if not _skip_validation: self.validator()
         #We now freeze all setter methods of dict so that the table does not change
         self.update = freeze(self.update)
         self.setdefault = freeze(self.setdefault)
@@ -40,10 +49,17 @@ class Table(dict):
         assert self.same_symbols(), 'Preference lists do not share the same symbols.'
     
     def right_type(self) -> bool:
-        '''Assesses whether table is of the right type'''
-        return isinstance(self,dict) and  \
-                all(isinstance(x, Sequence) for x in self.values()) and \
-                all(all(isinstance(y, Sym.__args__) for y in x) for x in self.values())
+        '''
+        Assesses whether table is of the right type. 
+        The types of the elements are collected per preference list with one C-level pass 
+        (set(map(type, x))), so that isinstance is only checked once per distinct type.
+        '''
+        if not isinstance(self,dict): return False
+        elem_types: set = set()
+        for x in self.values():
+            if not isinstance(x, Sequence): return False
+            elem_types.update(map(type, x))
+        return all(issubclass(t, _SYM_TYPES) for t in elem_types)
     
     def consistent_dimension(self) -> bool: 
         '''Assesses whether the table preference lists have consistent dimensions'''
@@ -55,21 +71,34 @@ class Table(dict):
         return all(len(pref_list) == len(set(pref_list))  for pref_list in self.values())
     
     def same_symbols(self) -> bool:
-        '''Checks whether preference lists share the same symbols.'''
-        prev = None
-        for v in self.values():
-            if prev is not None and set(v) != prev: return False
-            prev = set(v)
-        return True
+        '''
+        Checks whether preference lists share the same symbols.
+        Since no_duplicates and consistent_dimension are validated first, it suffices that every 
+        preference list is contained in the set of symbols of the first one (no set per list).
+        '''
+        pref_lists = iter(self.values())
+        first: set = set(next(pref_lists, ()))
+        return all(first.issuperset(v) for v in pref_lists)
     
-    def get_rank(self) -> None: 
+    @cached_property
+    def rank(self) -> Dict[Sym,Dict[Sym,int]]: 
         '''
-        Creates a version of the table where the preference lists (values of the dictionary) are inverted.
+        A version of the table where the preference lists (values of the dictionary) are inverted.
         A preference list ["a","b","c"] becomes a ranking dictionary {"a":1,"b":2,"c":3} 
         so that output[X][y] is the ranking of y according to X.
         Rankings begin from zero.
+        The rankings are computed when first accessed and then cached, since the table is frozen.
         '''
-        self.rank = {key: {v:i for i,v in enumerate(val)} | {None:len(val)}  for key,val in self.items()}
+        rank: Dict[Sym,Dict[Sym,int]] = {}
+        for key, val in self.items():
+            rank_key = {v:i for i,v in enumerate(val)}
+            rank_key[None] = len(val)   #Added in place; a dict union would copy the ranking dictionary
+            rank[key] = rank_key
+        return rank
+
+    def get_rank(self) -> None:
+        '''Computes the rankings (self.rank) now instead of when they are first accessed.'''
+        self.rank
     
     def __repr__(self) -> str:
         '''
@@ -77,6 +106,42 @@ class Table(dict):
         '''
         n: int = len(self)
         matrix: List[List[Sym]] = [[k] + list(v) for k, v in self.items()]
-        ordinal = lambda n: "%d%s" % (n,"tsnrhtdd"[(n//10%10!=1)*(n%10<4)*n%10::4])
-        headers: List[str] = [""] + [ordinal(i) for i in range(1,n+1)]
-        return str(tabulate(matrix,tablefmt="fancy_grid",headers=headers))
\ No newline at end of file
+        headers: List[str] = [""] + [_ordinal(i) for i in range(1,n+1)]
+        return str(tabulate(matrix,tablefmt="fancy_grid",headers=headers))
+
+class _Table_Arrays:
+    '''
+    Read-only integer representation of a (validated) Table that is used by the solver.
+    The keys of the table are mapped to 0:n-1 (syms[i] is the symbol of index i and sym2idx 
+    is the inverse map) and the symbols in the preference lists are mapped to 0:n-1 in the order 
+    of other_syms (the keys of the other table). Then pref[i,k] is the k-th preference of i and 
+    rank[i,j] is the ranking of j according to i. The imaginary undesirable symbol None gets 
+    the index n, so the last column of rank is equal to n (the highest ranking).
+    If the preference lists are already given as indices (pref), they are not translated.
+    '''
+    __slots__ = ('n','pref','_rank','syms','sym2idx')
+
+    def __init__(self, table: Table, other_syms: Iterable[Sym], pref: np.ndarray|None = None) -> None:
+        self.syms: List[Sym] = list(table)
+        self.sym2idx: Dict[Sym,int] = {sym:i for i,sym in enumerate(self.syms)}
+        self.n: int = len(self.syms)
+        n: int = self.n
+        if pref is None:
+            other_sym2idx: Dict[Sym,int] = {sym:j for j,sym in enumerate(other_syms)}
+            pref = np.array([[other_sym2idx[y] for y in table[sym]] for sym in self.syms], 
+                            dtype=np.int32).reshape(n,n)
+        self.pref: np.ndarray = pref
+        self._rank: np.ndarray|None = None
+
+    @property
+    def rank(self) -> np.ndarray:
+        '''
+        The rank array is computed when first accessed and then cached (the solver only needs
+        the rankings of the acceptors); a property is used since the class has __slots__.
+        '''
+        if self._rank is None:
+            n: int = self.n
+            self._rank = np.empty((n,n+1), dtype=np.int32)
+            self._rank[np.arange(n)[:,None], self.pref] = np.arange(n, dtype=np.int32)
+            self._rank[:,n] = n
+        return self._rank
\ No newline at end of file
@@ -1,11 +1,12 @@
 from math import comb
 from itertools import combinations
-from typing import Set
+from typing import Iterator, Set, Tuple
 
 def assertions(num:int) -> None:
     '''
     Input: num 
     This function asserts whether the input num is a positive integer
+    Calls are guarded by __debug__, so they are compiled out entirely under python -O.
     '''
     assert isinstance(num,int), "Input to binary_digit_sum should be int"
     assert num > 0, "Input integer should be positive"
@@ -16,10 +17,9 @@ def binary_digit_sum(num: int) -> int:
     Output: sum of digits of num in binary. 
     Example: num = 12 (base 10) = 1100 (base 2) => output 1+1+0+0 = 2
     '''
-    assertions(num)
-    res = 0
-    while num:  num, res = num//2, res + num%2
-    return res
+    if __debug__: assertions(num)
+    # Number of ones in the binary representation (popcount), computed in C
+    return num.bit_count()
 
 def binary_array(num: int) -> list[str]:
     '''
@@ -27,7 +27,7 @@ def binary_array(num: int) -> list[str]:
     Output: list of digits of num in binary.
     Example: num = 12 (base 10) = 1100 (base 2) => output ['1', '1', '0', '0']
     '''
-    assertions(num)
+    if __debug__: assertions(num)
     return list(bin(num)[2:])
 
 def num_comb_group_in_half(k: int) -> int:
@@ -35,7 +35,7 @@ def num_comb_group_in_half(k: int) -> int:
     There are 2k people in a group, k>0. 
     Output: Number of ways of spliting the group to two equally sized groups of k people.
     '''
-    assertions(k)
+    if __debug__: assertions(k)
     # There are n choose m ways to split a group of n people into groups of m and n-m. 
     # Hence our answer is 2k choose k.
     return comb(2*k,k)
@@ -47,10 +47,28 @@ def pairs_group_in_half(k: int) -> list[list[Set[int]]]:
     Example: for k=1=> 2 people the list of possible pairs is 
     [ [ {0}, {1}], [{1} , {0}] ]
     '''
-    assertions(k)
+    if __debug__: assertions(k)
     assert k <= 10, "Splitting a group of more than 20 people results in more than 7*10^5 pairs! Decrease k."
     group = set(range(2*k))
-    return [[ set(c) , group - set(c) ] for c in  combinations(range(2*k),k)]
+    return [[ (s := set(c)) , group - s ] for c in  combinations(range(2*k),k)]
+
+def bitmask_pairs_group_in_half(k: int) -> Iterator[Tuple[int,int]]:
+    '''
+    There are 2k people in a group, k>0. 
+    Output: Iterator over all possible pairs as bitmasks; person i is in a group iff bit i is set.
+    The masks with k bits set are enumerated in increasing order with Gosper's hack, 
+    so no sets are allocated (and there is no limit on k).
+    Example: for k=1=> 2 people the possible pairs are 
+    (0b01, 0b10), (0b10, 0b01)
+    '''
+    if __debug__: assertions(k)
+    group = (1 << 2*k) - 1
+    mask = (1 << k) - 1
+    while mask <= group:
+        yield mask, group ^ mask
+        c = mask & -mask
+        r = mask + c
+        mask = (((r ^ mask) >> 2) // c) | r
 
 if __name__ == "__main__":
     # Binary representations
@@ -62,4 +80,7 @@ if __name__ == "__main__":
     print("There are {} ways of splitting a group of {} people in groups of {}.".format(
         num_comb_group_in_half(k), 2* k, k
     ))
-    print("Those pairs are {}".format(pairs_group_in_half(k)))
\ No newline at end of file
+    print("Those pairs are {}".format(pairs_group_in_half(k)))
+    print("As bitmasks those pairs are {}".format(
+        [(bin(a), bin(b)) for a, b in bitmask_pairs_group_in_half(k)]
+    ))
\ No newline at end of file